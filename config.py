@@ -6,7 +6,39 @@ load_dotenv()
 GEMINI_MODEL = "gemini-3-flash-preview"
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
-CHROMA_DB_PERSIST_DIRECTORY_PATH = os.path.join(PROJECT_ROOT, "chroma_db")
+CHROMA_DB_PERSIST_DIRECTORY_PATH = os.getenv("CHROMA_DIR", os.path.join(PROJECT_ROOT, "chroma_db"))
+# Opt in (CHROMA_TMPFS=1) to keep the Chroma store on RAM-backed tmpfs for the
+# life of this process: no disk writes, but nothing survives a restart
+CHROMA_DB_ON_TMPFS = os.getenv("CHROMA_TMPFS", "0") == "1" and os.access("/dev/shm", os.W_OK)
+if CHROMA_DB_ON_TMPFS:
+    CHROMA_DB_PERSIST_DIRECTORY_PATH = os.path.join("/dev/shm", f"chroma_db_{os.getpid()}")
+# Set to use a shared Chroma server instead of the local persist directory
+CHROMA_SERVER_HOST = os.getenv("CHROMA_SERVER_HOST")
+CHROMA_SERVER_PORT = int(os.getenv("CHROMA_SERVER_PORT", "8000"))
+HNSW_SPACE = os.getenv("HNSW_SPACE", "cosine")
+# Unset HNSW values are picked from the corpus size, see vector_store._hnsw_config
+HNSW_M = int(os.environ["HNSW_M"]) if os.getenv("HNSW_M") else None
+HNSW_CONSTRUCTION_EF = int(os.environ["HNSW_CONSTRUCTION_EF"]) if os.getenv("HNSW_CONSTRUCTION_EF") else None
+HNSW_SEARCH_EF = int(os.environ["HNSW_SEARCH_EF"]) if os.getenv("HNSW_SEARCH_EF") else None
+# Serial extraction runs at ~1.4 ms per page and each pool worker takes
+# ~0.1-0.4 s to start, so the pool only pays off on a few hundred pages
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "500"))
+# Opt-in: the cache keeps each PDF's full extracted text on disk
+PDF_CACHE_ENABLED = os.getenv("PDF_CACHE_ENABLED", "0") == "1"
+PDF_CACHE_DIRECTORY_PATH = os.path.join(PROJECT_ROOT, "cache")
+PDF_CACHE_MAX_AGE_SECONDS = int(os.getenv("PDF_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 60 * 60)))
+VECTOR_STORE_BATCH_SIZE = 512
+MAX_MEMORY_STORES = int(os.getenv("MAX_MEMORY_STORES", "4"))
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE")
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "8"))
+ATTRIBUTE_BATCH_SIZE = int(os.getenv("ATTRIBUTE_BATCH_SIZE", "10"))
+CONTEXT_CACHE_ENABLED = os.getenv("CONTEXT_CACHE_ENABLED", "1") == "1"
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("CONTEXT_CACHE_TTL_SECONDS", "600"))
+BATCH_POLL_INTERVAL_SECONDS = int(os.getenv("BATCH_POLL_INTERVAL_SECONDS", "30"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = os.path.join(PROJECT_ROOT, "llm_cache.sqlite3")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
 
 
 def get_secret(key: str) -> str:
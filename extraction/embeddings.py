@@ -0,0 +1,228 @@
+import platform
+from functools import lru_cache
+
+import numpy as np
+import onnxruntime
+import torch
+from langchain_core.embeddings import Embeddings
+from sentence_transformers import SentenceTransformer
+
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_ONNX_FILE
+
+# Approximate token-length buckets for ``encode``'s batch sizing; texts
+# longer than the last bound share the final bucket. Characters per token
+# is a rough estimate for English text, good enough for grouping.
+LENGTH_BUCKETS = (64, 128, 256)
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _cpu_flags() -> frozenset[str]:
+    """
+    Return the CPU feature flags reported by the OS.
+
+    Returns
+    -------
+    frozenset[str]
+        Flags from the first ``flags`` line of ``/proc/cpuinfo``, or an
+        empty set where that file is not available (non-Linux systems).
+    """
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return frozenset(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return frozenset()
+
+
+def _onnx_file(provider: str) -> str:
+    """
+    Return the ONNX export to load for an execution provider.
+
+    Parameters
+    ----------
+    provider : str
+        The ONNX Runtime execution provider the model will run on.
+
+    Returns
+    -------
+    str
+        ``EMBEDDING_ONNX_FILE`` if set. Otherwise the O4-optimized export
+        (fused graph in FP16) on CUDA. On CPU, the INT8-quantized export
+        built for the CPU's instruction set: arm64, AVX-512 VNNI or AVX2,
+        checked against the reported CPU flags. If none of these can be
+        confirmed, the FP32 export, since an INT8 export built for other
+        instructions can lose accuracy.
+    """
+    if EMBEDDING_ONNX_FILE:
+        return EMBEDDING_ONNX_FILE
+    if provider == "CUDAExecutionProvider":
+        return "onnx/model_O4.onnx"
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    flags = _cpu_flags()
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx2" in flags:
+        return "onnx/model_quint8_avx2.onnx"
+    return "onnx/model.onnx"
+
+
+def _auto_device() -> str:
+    """
+    Return the best PyTorch device available on this machine.
+
+    Returns
+    -------
+    str
+        ``"cuda"`` if a CUDA GPU is available, else ``"mps"`` on Apple
+        silicon with Metal support, else ``"cpu"``.
+    """
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    LangChain embeddings backed by a reduced-precision SentenceTransformer.
+
+    When ONNX Runtime has CUDA support and a CUDA GPU is present, the model
+    runs the O4-optimized ONNX graph in FP16 on the GPU. With a CUDA or Apple MPS device but no
+    CUDA ONNX Runtime, the PyTorch model runs there cast to FP16 instead
+    (see ``_auto_device``). Otherwise it runs on ONNX Runtime using the
+    model's INT8 dynamically quantized export for this CPU, or the FP32
+    export if no matching one is found (see ``_onnx_file``). Vectors
+    are L2-normalized in all cases, so cosine similarity is preserved.
+
+    Parameters
+    ----------
+    model_name : str
+        Name or path of the SentenceTransformer model.
+    batch_size : int, optional
+        Number of texts encoded per forward pass. Default is
+        ``EMBEDDING_BATCH_SIZE``.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = EMBEDDING_BATCH_SIZE):
+        # The provider list only says the wheel was built with CUDA, not
+        # that a GPU is present
+        if (
+            "CUDAExecutionProvider" in onnxruntime.get_available_providers()
+            and torch.cuda.is_available()
+        ):
+            self.model = SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={
+                    "file_name": _onnx_file("CUDAExecutionProvider"),
+                    "provider": "CUDAExecutionProvider",
+                },
+            )
+        elif (device := _auto_device()) != "cpu":
+            self.model = SentenceTransformer(model_name, device=device)
+            self.model.half()
+        else:
+            self.model = SentenceTransformer(
+                model_name,
+                backend="onnx",
+                model_kwargs={"file_name": _onnx_file("CPUExecutionProvider")},
+            )
+        self.batch_size = batch_size
+
+    def warm_up(self) -> None:
+        """
+        Run one throwaway encode so session setup is not paid by the first caller.
+        """
+        self.encode(["warm up"])
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed a list of texts into a single array.
+
+        Skips the conversion to nested Python lists that the LangChain
+        interface requires, so callers that accept arrays (e.g. ChromaDB)
+        avoid boxing every float.
+
+        Texts are split into ``LENGTH_BUCKETS`` groups by approximate token
+        length, and shorter groups are encoded with proportionally larger
+        batches, so short texts take fewer forward passes. Padding is not
+        affected: ``SentenceTransformer.encode`` already length-sorts its
+        input. Rows are returned in input order.
+
+        Parameters
+        ----------
+        texts : list[str]
+            The texts to embed.
+
+        Returns
+        -------
+        np.ndarray
+            A C-contiguous float32 array of shape ``(len(texts), dim)``
+            with one normalized embedding per row.
+        """
+        if not texts:
+            return np.empty(
+                (0, self.model.get_sentence_embedding_dimension()), dtype=np.float32
+            )
+
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind="stable")
+        stops = np.searchsorted(
+            lengths[order],
+            [bound * CHARS_PER_TOKEN for bound in LENGTH_BUCKETS[:-1]],
+            side="right",
+        ).tolist() + [len(texts)]
+
+        parts = []
+        start = 0
+        for bound, stop in zip(LENGTH_BUCKETS, stops):
+            if stop > start:
+                parts.append(self.model.encode(
+                    [texts[i] for i in order[start:stop]],
+                    batch_size=self.batch_size * LENGTH_BUCKETS[-1] // bound,
+                    normalize_embeddings=True,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                ))
+            start = stop
+
+        embeddings = np.empty((len(texts), parts[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.concatenate(parts)
+        return embeddings
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed a list of texts.
+
+        Parameters
+        ----------
+        texts : list[str]
+            The texts to embed.
+
+        Returns
+        -------
+        list[list[float]]
+            One normalized embedding per text.
+        """
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        """
+        Embed a single query string.
+
+        Parameters
+        ----------
+        text : str
+            The query to embed.
+
+        Returns
+        -------
+        list[float]
+            The normalized query embedding.
+        """
+        return self.embed_documents([text])[0]
@@ -1,9 +1,42 @@
+import asyncio
 import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections.abc import Callable
+from contextlib import aclosing
+from functools import lru_cache
 
 import chromadb
+import orjson
+from google import genai
+from google.genai import types
 from langchain_google_genai import ChatGoogleGenerativeAI
-from extraction.vector_store import query_vector_store
-from config import GEMINI_MODEL, get_secret
+from extraction.llm_cache import (
+    get_cached,
+    get_cached_many,
+    make_cache_key,
+    set_cached,
+    set_cached_many,
+)
+from extraction.vector_store import query_vector_store, query_vector_store_batch
+from config import (
+    ATTRIBUTE_BATCH_SIZE,
+    BATCH_POLL_INTERVAL_SECONDS,
+    CONTEXT_CACHE_ENABLED,
+    CONTEXT_CACHE_TTL_SECONDS,
+    GEMINI_MODEL,
+    MAX_CONCURRENCY,
+    get_secret,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever SYSTEM_PROMPT or BATCH_SYSTEM_PROMPT change, so cached
+# answers produced by an older prompt are not reused.
+PROMPT_VERSION = "v3"
 
 SYSTEM_PROMPT = """You are reading excerpts from a legal document.
 Based only on these excerpts, extract the value for the requested attribute.
@@ -14,46 +47,116 @@ Respond in JSON with exactly these keys:
 
 Respond with ONLY the JSON object, no markdown fences, no extra text."""
 
+BATCH_SYSTEM_PROMPT = """You are reading excerpts from a legal document.
+Each excerpt is labelled with an id such as [C1] and its page number.
+Based only on these excerpts, extract the value for each requested attribute,
+looking first at the excerpts listed as its focus.
+Respond in JSON with one key per requested attribute, spelled exactly as given.
+Each key maps to an object with exactly these keys:
+- "value": the extracted answer (use "not found" if the answer is not in the excerpts)
+- "confidence": "high", "medium", or "low" based on how clearly the answer appears
+- "reasoning": one sentence explaining where you found it
+- "sources": the ids of the excerpts the answer comes from, e.g. ["C3"]
 
-def extract_attribute(
-    collection: chromadb.Collection,
-    attribute_name: str,
-    k: int = 5,
-) -> dict:
+Respond with ONLY the JSON object, no markdown fences, no extra text."""
+
+# Captures the body of a response, minus any surrounding ```json fences
+JSON_FENCE_PATTERN = re.compile(r"^\s*(?:```[\w-]*)?\s*(.*?)\s*(?:```)?\s*$", re.DOTALL)
+
+BATCH_JOB_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+_llm = None
+
+
+@lru_cache(maxsize=1)
+def _api_key() -> str:
     """
-    Query the collection using the attribute name, then ask Gemini
-    to extract its value from the retrieved chunks.
+    Return the Google API key, looking it up only once per process.
+
+    ``get_secret`` probes Streamlit secrets before the environment, which
+    is too slow to repeat for every request.
+
+    Returns
+    -------
+    str
+        The ``GOOGLE_API_KEY`` secret.
+    """
+    return get_secret("GOOGLE_API_KEY")
+
+
+@lru_cache(maxsize=1)
+def _get_genai_client() -> genai.Client:
+    """
+    Return a shared Gemini API client for synchronous calls.
+
+    Returns
+    -------
+    genai.Client
+        A reusable client authenticated with ``_api_key``.
+    """
+    return genai.Client(api_key=_api_key())
+
+
+def _create_llm(cached_content: str | None = None) -> ChatGoogleGenerativeAI:
+    """
+    Build a new ChatGoogleGenerativeAI client for ``GEMINI_MODEL``.
 
     Parameters
     ----------
-    collection : chromadb.Collection
-        A ChromaDB collection to search.
-    attribute_name : str
-        The name of the attribute to extract (e.g. "borrower").
-    k : int, optional
-        Number of top chunks to retrieve. Default is 5.
+    cached_content : str, optional
+        Name of a Gemini context cache to prepend to every request.
 
     Returns
     -------
-    dict
-        A dict with keys:
-        - ``value``: the extracted answer string
-        - ``confidence``: one of "high", "medium", or "low"
-        - ``source_pages``: list of page numbers the chunks came from
-        - ``source_chunks``: list of raw chunk texts used
+    ChatGoogleGenerativeAI
+        A freshly constructed chat model instance.
     """
-    api_key = get_secret("GOOGLE_API_KEY")
+    return ChatGoogleGenerativeAI(
+        model=GEMINI_MODEL,
+        google_api_key=_api_key(),
+        cached_content=cached_content,
+    )
 
-    results = query_vector_store(collection, attribute_name, k=k)
 
-    docs = results["documents"][0]
-    metas = results["metadatas"][0]
+def _get_llm() -> ChatGoogleGenerativeAI:
+    """
+    Return a shared ChatGoogleGenerativeAI instance, creating it on first call.
 
-    source_chunks = docs
-    source_pages = list(dict.fromkeys(
-        meta.get("page") for meta in metas
-    ))
+    Returns
+    -------
+    ChatGoogleGenerativeAI
+        A reusable chat model instance.
+    """
+    global _llm
+    if _llm is None:
+        _llm = _create_llm()
+    return _llm
+
+
+def _build_messages(attribute_name: str, docs: list[str], metas: list[dict]) -> list[dict]:
+    """
+    Build the chat messages asking Gemini to extract one attribute.
+
+    Parameters
+    ----------
+    attribute_name : str
+        The name of the attribute to extract.
+    docs : list[str]
+        The retrieved chunk texts.
+    metas : list[dict]
+        The metadata for each retrieved chunk.
 
+    Returns
+    -------
+    list[dict]
+        The system and user messages to send to the model.
+    """
     context = "\n\n---\n\n".join(
         f"[Page {metas[i].get('page', '?')}]\n{docs[i]}"
         for i in range(len(docs))
@@ -65,16 +168,129 @@ def extract_attribute(
 
 Extract the value for: {attribute_name}"""
 
-    llm = ChatGoogleGenerativeAI(
-        model=GEMINI_MODEL,
-        google_api_key=api_key,
-    )
-    response = llm.invoke([
+    return [
         {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": user_message},
-    ])
+    ]
+
+
+def _build_shared_context(
+    docs_list: list[list[str]],
+    metas_list: list[list[dict]],
+    ids_list: list[list[str]],
+) -> tuple[str, dict[str, str], dict[str, tuple[str, dict]]]:
+    """
+    Build one context block from several attributes' retrieved chunks.
+
+    Chunks retrieved for more than one attribute appear only once, each
+    under a short label (``C1``, ``C2``, ...), so a batched prompt carries
+    the union of its attributes' chunks rather than one copy per attribute.
+
+    Parameters
+    ----------
+    docs_list : list[list[str]]
+        The retrieved chunk texts, one list per attribute.
+    metas_list : list[list[dict]]
+        The metadata for each retrieved chunk, one list per attribute.
+    ids_list : list[list[str]]
+        The ChromaDB ids of each retrieved chunk, one list per attribute.
+
+    Returns
+    -------
+    tuple[str, dict[str, str], dict[str, tuple[str, dict]]]
+        The context text, a mapping of ChromaDB id to chunk label, and a
+        mapping of ChromaDB id to the ``(text, metadata)`` of every chunk
+        in the context, in context order.
+    """
+    chunks = {}
+    for docs, metas, ids in zip(docs_list, metas_list, ids_list):
+        for doc, meta, chunk_id in zip(docs, metas, ids):
+            chunks.setdefault(chunk_id, (doc, meta))
+
+    labels = {chunk_id: f"C{n}" for n, chunk_id in enumerate(chunks, start=1)}
+    context = "\n\n---\n\n".join(
+        f"[{labels[chunk_id]}] [Page {meta.get('page', '?')}]\n{doc}"
+        for chunk_id, (doc, meta) in chunks.items()
+    )
+    return context, labels, chunks
+
+
+def _context_message(context: str) -> str:
+    """
+    Return the shared part of the batched user message.
+
+    Parameters
+    ----------
+    context : str
+        The shared context block from ``_build_shared_context``.
+
+    Returns
+    -------
+    str
+        The message prefix that introduces the excerpts.
+    """
+    return f"""Here are the relevant excerpts from the document:
+
+{context}"""
+
+
+def _build_batch_messages(
+    attribute_names: list[str],
+    ids_list: list[list[str]],
+    context: str | None,
+    labels: dict[str, str],
+) -> list[dict]:
+    """
+    Build the chat messages asking Gemini to extract several attributes at once.
+
+    Parameters
+    ----------
+    attribute_names : list[str]
+        The names of the attributes to extract.
+    ids_list : list[list[str]]
+        The ChromaDB ids of each attribute's retrieved chunks.
+    context : str | None
+        The shared context block from ``_build_shared_context``, or None
+        if it and the system prompt are already in a Gemini context cache.
+    labels : dict[str, str]
+        The chunk labels from ``_build_shared_context``.
 
-    content = response.content
+    Returns
+    -------
+    list[dict]
+        The messages to send to the model.
+    """
+    attributes = "\n".join(
+        f"- {json.dumps(name)} (focus: {', '.join(f'[{labels[chunk_id]}]' for chunk_id in ids)})"
+        for name, ids in zip(attribute_names, ids_list)
+    )
+
+    question = f"""Using the excerpts above, extract the value for each of these attributes:
+{attributes}"""
+
+    if context is None:
+        return [{"role": "user", "content": question}]
+
+    return [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{_context_message(context)}\n\n{question}"},
+    ]
+
+
+def _content_text(content) -> str:
+    """
+    Flatten the ``content`` of a Gemini message or stream chunk to text.
+
+    Parameters
+    ----------
+    content : str | list | dict
+        The message content, which may be a list of content parts.
+
+    Returns
+    -------
+    str
+        The text of the content.
+    """
     if isinstance(content, list):
         parts = []
         for part in content:
@@ -87,42 +303,685 @@ Extract the value for: {attribute_name}"""
         content = " ".join(parts)
     elif isinstance(content, dict) and "text" in content:
         content = content["text"]
-    raw = content.strip()
+    return content
+
+
+def _json_object_end(text: str) -> int | None:
+    """
+    Find where the first top-level JSON object in ``text`` ends.
+
+    Parameters
+    ----------
+    text : str
+        Text that may contain a JSON object, possibly still incomplete.
+
+    Returns
+    -------
+    int | None
+        The index just past the object's closing brace, or None if no
+        object has been closed yet.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def _stream_text(llm: ChatGoogleGenerativeAI, messages: list[dict]) -> str:
+    """
+    Stream a Gemini response, stopping once its JSON object is complete.
+
+    Parameters
+    ----------
+    llm : ChatGoogleGenerativeAI
+        Chat model to use.
+    messages : list[dict]
+        The messages to send.
+
+    Returns
+    -------
+    str
+        The response text, cut off after the first complete JSON object
+        if there is one.
+    """
+    text = ""
+    for chunk in llm.stream(messages):
+        piece = _content_text(chunk.content)
+        text += piece
+        if "}" in piece:
+            end = _json_object_end(text)
+            if end is not None:
+                return text[:end]
+    return text
+
+
+async def _astream_text(llm: ChatGoogleGenerativeAI, messages: list[dict]) -> str:
+    """
+    Async version of ``_stream_text``.
+
+    Parameters
+    ----------
+    llm : ChatGoogleGenerativeAI
+        Chat model to use.
+    messages : list[dict]
+        The messages to send.
+
+    Returns
+    -------
+    str
+        See ``_stream_text``.
+    """
+    text = ""
+    async with aclosing(llm.astream(messages)) as stream:
+        async for chunk in stream:
+            piece = _content_text(chunk.content)
+            text += piece
+            if "}" in piece:
+                end = _json_object_end(text)
+                if end is not None:
+                    return text[:end]
+    return text
+
+
+def _parse_response(content):
+    """
+    Flatten a Gemini response and decode its JSON body.
+
+    Parameters
+    ----------
+    content : str | list | dict
+        The ``content`` of the model response.
+
+    Returns
+    -------
+    tuple
+        ``(parsed, raw)`` where ``parsed`` is the decoded JSON value, or
+        None if the body is not valid JSON, and ``raw`` is the body text.
+    """
+    content = _content_text(content)
 
     # Strip markdown fences if present
-    if raw.startswith("```"):
-        raw = raw.split("\n", 1)[-1]
-    if raw.endswith("```"):
-        raw = raw.rsplit("```", 1)[0]
-    raw = raw.strip()
+    raw = JSON_FENCE_PATTERN.match(content).group(1)
 
     try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
-        parsed = {"value": raw, "confidence": "low", "reasoning": "Failed to parse JSON"}
+        return orjson.loads(raw), raw
+    except orjson.JSONDecodeError:
+        return None, raw
+
+
+def _answer_fields(parsed: dict) -> dict:
+    """
+    Pick the answer fields out of a parsed model response.
 
+    Parameters
+    ----------
+    parsed : dict
+        The decoded JSON object for one attribute.
+
+    Returns
+    -------
+    dict
+        A dict with ``value``, ``confidence``, and ``reasoning`` keys.
+    """
     return {
         "value": parsed.get("value", "not found"),
         "confidence": parsed.get("confidence", "low"),
         "reasoning": parsed.get("reasoning", ""),
+    }
+
+
+def _cache_key(attribute_name: str, docs: list[str]) -> str:
+    """
+    Return the response-cache key for an attribute and its chunks.
+
+    Parameters
+    ----------
+    attribute_name : str
+        The name of the attribute to extract.
+    docs : list[str]
+        The retrieved chunk texts.
+
+    Returns
+    -------
+    str
+        See ``make_cache_key``.
+    """
+    return make_cache_key(GEMINI_MODEL, attribute_name, docs, PROMPT_VERSION)
+
+
+def _cited_chunks(
+    source_ids,
+    chunks: dict[str, tuple[str, dict]],
+    focus_ids: list[str],
+) -> tuple[list[str], list[dict]]:
+    """
+    Return the chunks a batched answer was drawn from.
+
+    Parameters
+    ----------
+    source_ids : list[str] | None
+        The ChromaDB ids the answer cites. Ids that were not in the prompt
+        are ignored.
+    chunks : dict[str, tuple[str, dict]]
+        The chunks sent in the prompt, from ``_build_shared_context``.
+    focus_ids : list[str]
+        The ids of the attribute's own retrieved chunks, used when the
+        answer cites none of the prompt's chunks.
+
+    Returns
+    -------
+    tuple[list[str], list[dict]]
+        The texts and metadata of the cited chunks.
+    """
+    cited = []
+    if isinstance(source_ids, list):
+        cited = [chunk_id for chunk_id in source_ids if chunk_id in chunks]
+    ids = list(dict.fromkeys(cited)) or focus_ids
+    return [chunks[chunk_id][0] for chunk_id in ids], [chunks[chunk_id][1] for chunk_id in ids]
+
+
+def _format_result(parsed: dict, docs: list[str], metas: list[dict]) -> dict:
+    """
+    Combine a parsed model answer with its source chunks.
+
+    Parameters
+    ----------
+    parsed : dict
+        The decoded ``{value, confidence, reasoning}`` object.
+    docs : list[str]
+        The retrieved chunk texts.
+    metas : list[dict]
+        The metadata for each retrieved chunk.
+
+    Returns
+    -------
+    dict
+        See ``extract_attribute``.
+    """
+    source_chunks = docs
+    source_pages = list(dict.fromkeys(
+        meta.get("page") for meta in metas
+    ))
+
+    return {
+        **_answer_fields(parsed),
         "source_pages": source_pages,
         "source_chunks": source_chunks,
     }
 
 
+def _build_result(
+    content,
+    docs: list[str],
+    metas: list[dict],
+    cache_key: str | None = None,
+) -> dict:
+    """
+    Parse a single-attribute Gemini response into the result dict.
+
+    Parameters
+    ----------
+    content : str | list | dict
+        The ``content`` of the model response.
+    docs : list[str]
+        The retrieved chunk texts.
+    metas : list[dict]
+        The metadata for each retrieved chunk.
+    cache_key : str, optional
+        If given, a successfully parsed answer is stored under this key.
+
+    Returns
+    -------
+    dict
+        See ``extract_attribute``.
+    """
+    parsed, raw = _parse_response(content)
+    if not isinstance(parsed, dict):
+        parsed = {"value": raw, "confidence": "low", "reasoning": "Failed to parse JSON"}
+    elif cache_key is not None:
+        set_cached(cache_key, _answer_fields(parsed))
+    return _format_result(parsed, docs, metas)
+
+
+def extract_attribute(
+    collection: chromadb.Collection,
+    attribute_name: str,
+    k: int = 5,
+) -> dict:
+    """
+    Query the collection using the attribute name, then ask Gemini
+    to extract its value from the retrieved chunks.
+
+    Parameters
+    ----------
+    collection : chromadb.Collection
+        A ChromaDB collection to search.
+    attribute_name : str
+        The name of the attribute to extract (e.g. "borrower").
+    k : int, optional
+        Number of top chunks to retrieve. Default is 5.
+
+    Returns
+    -------
+    dict
+        A dict with keys:
+        - ``value``: the extracted answer string
+        - ``confidence``: one of "high", "medium", or "low"
+        - ``source_pages``: list of page numbers the chunks came from
+        - ``source_chunks``: list of raw chunk texts used
+    """
+    results = query_vector_store(collection, attribute_name, k=k)
+
+    docs = results["documents"][0]
+    metas = results["metadatas"][0]
+
+    cache_key = _cache_key(attribute_name, docs)
+    cached = get_cached(cache_key)
+    if cached is not None:
+        return _format_result(cached, docs, metas)
+
+    content = _stream_text(_get_llm(), _build_messages(attribute_name, docs, metas))
+    return _build_result(content, docs, metas, cache_key=cache_key)
+
+
+async def aextract_attribute(
+    collection: chromadb.Collection,
+    attribute_name: str,
+    k: int = 5,
+    llm: ChatGoogleGenerativeAI | None = None,
+) -> dict:
+    """
+    Async version of ``extract_attribute`` that awaits the Gemini call.
+
+    Parameters
+    ----------
+    collection : chromadb.Collection
+        A ChromaDB collection to search.
+    attribute_name : str
+        The name of the attribute to extract (e.g. "borrower").
+    k : int, optional
+        Number of top chunks to retrieve. Default is 5.
+    llm : ChatGoogleGenerativeAI, optional
+        Chat model to use. A new one is created if not given. Async
+        clients are tied to the event loop they first run on, so callers
+        should share one instance per loop rather than the module-level one.
+
+    Returns
+    -------
+    dict
+        See ``extract_attribute``.
+    """
+    if llm is None:
+        llm = _create_llm()
+
+    results = await asyncio.to_thread(query_vector_store, collection, attribute_name, k)
+
+    return await _aextract_from_chunks(
+        llm, attribute_name, results["documents"][0], results["metadatas"][0]
+    )
+
+
+async def _aextract_from_chunks(
+    llm: ChatGoogleGenerativeAI,
+    attribute_name: str,
+    docs: list[str],
+    metas: list[dict],
+) -> dict:
+    """
+    Ask Gemini to extract one attribute from already-retrieved chunks.
+
+    Parameters
+    ----------
+    llm : ChatGoogleGenerativeAI
+        Chat model to use.
+    attribute_name : str
+        The name of the attribute to extract.
+    docs : list[str]
+        The retrieved chunk texts.
+    metas : list[dict]
+        The metadata for each retrieved chunk.
+
+    Returns
+    -------
+    dict
+        See ``extract_attribute``.
+    """
+    cache_key = _cache_key(attribute_name, docs)
+    # The cache is SQLite, so keep its I/O off the event loop
+    cached = await asyncio.to_thread(get_cached, cache_key)
+    if cached is not None:
+        return _format_result(cached, docs, metas)
+
+    content = await _astream_text(llm, _build_messages(attribute_name, docs, metas))
+    return await asyncio.to_thread(_build_result, content, docs, metas, cache_key)
+
+
+async def _aextract_batch_from_chunks(
+    llm: ChatGoogleGenerativeAI,
+    attribute_names: list[str],
+    ids_list: list[list[str]],
+    context: str | None,
+    labels: dict[str, str],
+    chunks: dict[str, tuple[str, dict]],
+) -> dict[str, dict]:
+    """
+    Ask Gemini to extract several attributes in a single request.
+
+    Any attribute may be answered from any chunk in the prompt, so answers
+    are cached under a key covering every chunk sent, not just the
+    attribute's own, and report the chunks the model cites as sources.
+    Attributes already cached under that key are not asked again.
+
+    Parameters
+    ----------
+    llm : ChatGoogleGenerativeAI
+        Chat model to use.
+    attribute_names : list[str]
+        The names of the attributes to extract.
+    ids_list : list[list[str]]
+        The ChromaDB ids of each retrieved chunk, one list per attribute.
+    context : str | None
+        The shared context block from ``_build_shared_context``, or None
+        if ``llm`` is bound to a context cache that already holds it.
+    labels : dict[str, str]
+        The chunk labels from ``_build_shared_context``.
+    chunks : dict[str, tuple[str, dict]]
+        Every chunk in the prompt, from ``_build_shared_context``.
+
+    Returns
+    -------
+    dict[str, dict]
+        Results for the attributes the model answered. Attributes missing
+        from the response, or all of them if it was not valid JSON, are
+        left out so the caller can retry them one at a time.
+    """
+    prompt_docs = [doc for doc, _ in chunks.values()]
+    cache_keys = [_cache_key(name, prompt_docs) for name in attribute_names]
+    cached_answers = await asyncio.to_thread(get_cached_many, cache_keys)
+
+    results = {}
+    asked = []
+    for i, name in enumerate(attribute_names):
+        cached = cached_answers.get(cache_keys[i])
+        if cached is not None:
+            results[name] = _format_result(
+                cached, *_cited_chunks(cached.get("sources"), chunks, ids_list[i])
+            )
+        else:
+            asked.append(i)
+    if not asked:
+        return results
+
+    content = await _astream_text(llm, _build_batch_messages(
+        [attribute_names[i] for i in asked],
+        [ids_list[i] for i in asked],
+        context,
+        labels,
+    ))
+    parsed, _ = _parse_response(content)
+    if not isinstance(parsed, dict):
+        return results
+
+    label_ids = {label: chunk_id for chunk_id, label in labels.items()}
+    to_cache = {}
+    for i in asked:
+        answer = parsed.get(attribute_names[i])
+        if isinstance(answer, dict):
+            sources = answer.get("sources")
+            cited = [str(label).strip("[] ") for label in sources] if isinstance(sources, list) else []
+            source_ids = [label_ids[label] for label in cited if label in label_ids]
+            to_cache[cache_keys[i]] = {**_answer_fields(answer), "sources": source_ids}
+            results[attribute_names[i]] = _format_result(
+                answer, *_cited_chunks(source_ids, chunks, ids_list[i])
+            )
+    await asyncio.to_thread(set_cached_many, to_cache)
+    return results
+
+
+async def _acreate_context_cache(client: genai.Client, context: str) -> str | None:
+    """
+    Store the batch system prompt and shared context in a Gemini context cache.
+
+    Requests that reference the cache are billed at the reduced cached-token
+    rate for that prefix and only send the per-batch attribute list.
+
+    Parameters
+    ----------
+    client : genai.Client
+        Gemini API client.
+    context : str
+        The shared context block from ``_build_shared_context``.
+
+    Returns
+    -------
+    str | None
+        The cache name, or None if it could not be created (e.g. the
+        context is below the model's minimum cacheable size, or the
+        request failed).
+    """
+    try:
+        cache = await client.aio.caches.create(
+            model=GEMINI_MODEL,
+            config=types.CreateCachedContentConfig(
+                system_instruction=BATCH_SYSTEM_PROMPT,
+                contents=[types.Content(
+                    role="user",
+                    parts=[types.Part(text=_context_message(context))],
+                )],
+                ttl=f"{CONTEXT_CACHE_TTL_SECONDS}s",
+            ),
+        )
+    except Exception as exc:
+        # Includes refusals and network errors; the run falls back to
+        # sending each batch its own context
+        logger.warning("Could not create context cache: %s", exc)
+        return None
+    return cache.name
+
+
+async def aextract_all_attributes(
+    collection: chromadb.Collection,
+    attribute_list: list[str],
+    max_concurrency: int = MAX_CONCURRENCY,
+    batch_size: int = ATTRIBUTE_BATCH_SIZE,
+    progress_callback: Callable[[int, int], None] | None = None,
+    k: int = 5,
+) -> dict[str, dict]:
+    """
+    Extract multiple attributes concurrently.
+
+    Retrieval for every attribute is done in one batched query up front,
+    and attributes with a cached answer for the same chunks are served
+    from the response cache. The attribute list is split ``batch_size`` at
+    a time into batches, and the uncached attributes of each batch are
+    asked in a single Gemini prompt whose context is the deduplicated
+    union of the whole batch's chunks (see ``_build_shared_context``), so
+    a batch sends the same chunks, and hits the same cache keys, however
+    many of its attributes were already cached. The prompts run
+    concurrently. Any attribute the batched answer does not cover is
+    retried on its own, with only its own chunks.
+
+    When more than one request is needed and ``CONTEXT_CACHE_ENABLED`` is
+    set, the system prompt and the chunks of every attribute are instead
+    uploaded once as a Gemini context cache, and each request only sends
+    its attribute list. If the cache cannot be created, requests fall back
+    to per-batch contexts.
+
+    Parameters
+    ----------
+    collection : chromadb.Collection
+        A ChromaDB collection to search.
+    attribute_list : list[str]
+        A list of attribute names to extract.
+    max_concurrency : int, optional
+        Maximum number of Gemini requests in flight at once. Default is
+        ``MAX_CONCURRENCY`` (env ``MAX_CONCURRENCY``, 8 if unset).
+    batch_size : int, optional
+        Number of attributes to ask for per Gemini request. Default is
+        ``ATTRIBUTE_BATCH_SIZE`` (env ``ATTRIBUTE_BATCH_SIZE``, 10 if unset).
+        Use 1 to send one request per attribute.
+    progress_callback : Callable[[int, int], None], optional
+        Called as ``progress_callback(done, total)`` after the cache lookup
+        and whenever a Gemini request finishes, with the number of
+        attributes answered so far. Default is None.
+    k : int, optional
+        Number of top chunks to retrieve per attribute. Default is 5.
+
+    Returns
+    -------
+    dict[str, dict]
+        A mapping of ``{attribute_name: result_dict}`` where each
+        ``result_dict`` is the output of ``extract_attribute``.
+    """
+    if not attribute_list:
+        return {}
+
+    def report_progress() -> None:
+        if progress_callback is not None:
+            progress_callback(len(extracted), len(attribute_list))
+
+    results = await asyncio.to_thread(query_vector_store_batch, collection, attribute_list, k)
+    all_docs = results["documents"]
+    all_metas = results["metadatas"]
+    all_ids = results["ids"]
+
+    extracted = {}
+    pending = []
+    cache_keys = [_cache_key(name, docs) for name, docs in zip(attribute_list, all_docs)]
+    cached_answers = await asyncio.to_thread(get_cached_many, cache_keys)
+    for i, name in enumerate(attribute_list):
+        cached = cached_answers.get(cache_keys[i])
+        if cached is not None:
+            extracted[name] = _format_result(cached, all_docs[i], all_metas[i])
+        else:
+            pending.append(i)
+    report_progress()
+
+    batch_size = max(batch_size, 1)
+    pending_set = set(pending)
+    batches = [
+        list(range(start, min(start + batch_size, len(attribute_list))))
+        for start in range(0, len(attribute_list), batch_size)
+    ]
+    batches = [batch for batch in batches if pending_set.intersection(batch)]
+
+    client = None
+    cache_name = None
+    cached_labels = cached_chunks = None
+    try:
+        if CONTEXT_CACHE_ENABLED and len(batches) > 1:
+            # One run-wide block is only worth it when it is uploaded once
+            context, cached_labels, cached_chunks = _build_shared_context(all_docs, all_metas, all_ids)
+            # A fresh client per run, since async clients are tied to one event loop
+            client = genai.Client(api_key=_api_key())
+            cache_name = await _acreate_context_cache(client, context)
+
+        llm = _create_llm(cached_content=cache_name)
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def guarded_batch(indices: list[int]) -> None:
+            asked = [i for i in indices if i in pending_set]
+            if cache_name:
+                request_context, labels, chunks = None, cached_labels, cached_chunks
+            else:
+                request_context, labels, chunks = _build_shared_context(
+                    [all_docs[i] for i in indices],
+                    [all_metas[i] for i in indices],
+                    [all_ids[i] for i in indices],
+                )
+            try:
+                async with sem:
+                    extracted.update(await _aextract_batch_from_chunks(
+                        llm,
+                        [attribute_list[i] for i in asked],
+                        [all_ids[i] for i in asked],
+                        request_context,
+                        labels,
+                        chunks,
+                    ))
+            finally:
+                report_progress()
+
+        await asyncio.gather(*[guarded_batch(batch) for batch in batches])
+
+        if batch_size > 1:
+            remaining = [i for i in pending if attribute_list[i] not in extracted]
+            await asyncio.gather(*[guarded_batch([i]) for i in remaining])
+    finally:
+        if cache_name:
+            try:
+                await client.aio.caches.delete(name=cache_name)
+            except Exception as exc:
+                # Not worth failing the run over; the cache expires on its TTL
+                logger.warning("Could not delete context cache %s: %s", cache_name, exc)
+        if client is not None:
+            await client.aio.aclose()
+
+    missing = [i for i in pending if attribute_list[i] not in extracted]
+    for i in missing:
+        extracted[attribute_list[i]] = _format_result(
+            {"value": "not found", "confidence": "low", "reasoning": "No answer in model response"},
+            all_docs[i],
+            all_metas[i],
+        )
+    if missing:
+        report_progress()
+
+    return {name: extracted[name] for name in attribute_list}
+
+
 def extract_all_attributes(
     collection,
     attribute_list: list[str],
+    max_concurrency: int = MAX_CONCURRENCY,
+    batch_size: int = ATTRIBUTE_BATCH_SIZE,
+    progress_callback: Callable[[int, int], None] | None = None,
+    k: int = 5,
 ) -> dict[str, dict]:
     """
     Extract multiple attributes from the document.
 
+    Runs ``aextract_all_attributes`` on a new event loop, so the Gemini
+    calls overlap instead of running one after another.
+
     Parameters
     ----------
     collection : chromadb.Collection
         A ChromaDB collection to search.
     attribute_list : list[str]
         A list of attribute names to extract.
+    max_concurrency : int, optional
+        Maximum number of Gemini requests in flight at once. Default is
+        ``MAX_CONCURRENCY``.
+    batch_size : int, optional
+        Number of attributes to ask for per Gemini request. Default is
+        ``ATTRIBUTE_BATCH_SIZE``.
+    progress_callback : Callable[[int, int], None], optional
+        Called as ``progress_callback(done, total)`` as attributes are
+        answered. Default is None.
+    k : int, optional
+        Number of top chunks to retrieve per attribute. Default is 5.
 
     Returns
     -------
@@ -130,10 +989,140 @@ def extract_all_attributes(
         A mapping of ``{attribute_name: result_dict}`` where each
         ``result_dict`` is the output of ``extract_attribute``.
     """
-    results = {}
-    for name in attribute_list:
-        results[name] = extract_attribute(collection, name)
-    return results
+    return asyncio.run(
+        aextract_all_attributes(
+            collection,
+            attribute_list,
+            max_concurrency=max_concurrency,
+            batch_size=batch_size,
+            progress_callback=progress_callback,
+            k=k,
+        )
+    )
+
+
+def extract_all_attributes_batch(
+    collection: chromadb.Collection,
+    attribute_list: list[str],
+    async_ok: bool = False,
+    k: int = 5,
+    poll_interval: int = BATCH_POLL_INTERVAL_SECONDS,
+) -> dict[str, dict]:
+    """
+    Extract multiple attributes through the Gemini Batch API.
+
+    Every uncached attribute becomes one line of a JSONL batch job, which
+    is billed at roughly half the interactive price but can take minutes
+    to hours to finish. This call blocks, polling until the job is done.
+
+    Parameters
+    ----------
+    collection : chromadb.Collection
+        A ChromaDB collection to search.
+    attribute_list : list[str]
+        A list of attribute names to extract.
+    async_ok : bool, optional
+        Must be True to actually submit a batch job, as a guard against
+        using it where an answer is needed right away. If False (default),
+        falls back to ``extract_all_attributes``.
+    k : int, optional
+        Number of top chunks to retrieve per attribute. Default is 5.
+    poll_interval : int, optional
+        Seconds to wait between job status checks. Default is
+        ``BATCH_POLL_INTERVAL_SECONDS``.
+
+    Returns
+    -------
+    dict[str, dict]
+        A mapping of ``{attribute_name: result_dict}`` where each
+        ``result_dict`` is the output of ``extract_attribute``.
+
+    Raises
+    ------
+    RuntimeError
+        If the batch job does not finish successfully.
+    """
+    if not async_ok:
+        return extract_all_attributes(collection, attribute_list, k=k)
+    if not attribute_list:
+        return {}
+
+    results = query_vector_store_batch(collection, attribute_list, k=k)
+    all_docs = results["documents"]
+    all_metas = results["metadatas"]
+
+    extracted = {}
+    lines = []
+    cached_answers = get_cached_many(
+        [_cache_key(name, docs) for name, docs in zip(attribute_list, all_docs)]
+    )
+    for i, name in enumerate(attribute_list):
+        cached = cached_answers.get(_cache_key(name, all_docs[i]))
+        if cached is not None:
+            extracted[name] = _format_result(cached, all_docs[i], all_metas[i])
+            continue
+        system_message, user_message = _build_messages(name, all_docs[i], all_metas[i])
+        lines.append(json.dumps({
+            "key": str(i),
+            "request": {
+                "system_instruction": {"parts": [{"text": system_message["content"]}]},
+                "contents": [{"role": "user", "parts": [{"text": user_message["content"]}]}],
+            },
+        }))
+
+    if lines:
+        client = _get_genai_client()
+
+        with tempfile.NamedTemporaryFile("w", delete=False, suffix=".jsonl") as tmp:
+            tmp.write("\n".join(lines))
+            tmp_path = tmp.name
+        try:
+            uploaded = client.files.upload(
+                file=tmp_path,
+                config=types.UploadFileConfig(
+                    display_name="attribute-extraction", mime_type="jsonl"
+                ),
+            )
+        finally:
+            os.unlink(tmp_path)
+
+        job = client.batches.create(
+            model=GEMINI_MODEL,
+            src=uploaded.name,
+            config={"display_name": "attribute-extraction"},
+        )
+        while job.state.name not in BATCH_JOB_DONE_STATES:
+            time.sleep(poll_interval)
+            job = client.batches.get(name=job.name)
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Gemini batch job {job.name} ended in state {job.state.name}.")
+
+        output = client.files.download(file=job.dest.file_name).decode("utf-8")
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            i = int(item["key"])
+            name = attribute_list[i]
+            try:
+                parts = item["response"]["candidates"][0]["content"]["parts"]
+            except (KeyError, IndexError, TypeError):
+                continue
+            content = "".join(part.get("text", "") for part in parts if not part.get("thought"))
+            extracted[name] = _build_result(
+                content, all_docs[i], all_metas[i], cache_key=_cache_key(name, all_docs[i])
+            )
+
+    for i, name in enumerate(attribute_list):
+        if name not in extracted:
+            extracted[name] = _format_result(
+                {"value": "not found", "confidence": "low", "reasoning": "Batch request failed"},
+                all_docs[i],
+                all_metas[i],
+            )
+
+    return {name: extracted[name] for name in attribute_list}
 
 
 def save_results(results: dict, output_path: str = "results.json") -> None:
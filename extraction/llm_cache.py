@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS
+
+
+def make_cache_key(
+    model: str,
+    attribute_name: str,
+    chunks: list[str],
+    prompt_version: str,
+) -> str:
+    """
+    Build a cache key for one attribute extraction.
+
+    Parameters
+    ----------
+    model : str
+        The Gemini model name.
+    attribute_name : str
+        The name of the attribute being extracted.
+    chunks : list[str]
+        The chunk texts the answer is based on. Order does not matter.
+    prompt_version : str
+        Version tag of the prompt, bumped whenever the prompt changes.
+
+    Returns
+    -------
+    str
+        A SHA-256 hex digest identifying the request.
+    """
+    chunk_hashes = sorted(
+        hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks
+    )
+    payload = json.dumps({
+        "model": model,
+        "attr": attribute_name,
+        "chunks": chunk_hashes,
+        "prompt_v": prompt_version,
+    })
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Open the cache database, creating the table if needed.
+
+    Returns
+    -------
+    sqlite3.Connection
+        An open connection to ``LLM_CACHE_PATH``.
+    """
+    conn = sqlite3.connect(LLM_CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS llm_cache ("
+        "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+    )
+    return conn
+
+
+# Keys per SELECT, well under SQLite's bound-parameter limit
+_LOOKUP_BATCH_SIZE = 500
+
+
+def get_cached_many(keys: list[str]) -> dict[str, dict]:
+    """
+    Look up several cached extraction answers with one connection.
+
+    Parameters
+    ----------
+    keys : list[str]
+        Keys from ``make_cache_key``.
+
+    Returns
+    -------
+    dict[str, dict]
+        The cached ``{value, confidence, reasoning}`` dict for each key that
+        is present and not expired. Empty if caching is disabled.
+    """
+    if not LLM_CACHE_ENABLED or not keys:
+        return {}
+    found = {}
+    now = time.time()
+    with closing(_connect()) as conn:
+        for start in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+            batch = keys[start:start + _LOOKUP_BATCH_SIZE]
+            rows = conn.execute(
+                f"SELECT key, value FROM llm_cache WHERE expires_at > ? "
+                f"AND key IN ({', '.join('?' * len(batch))})",
+                (now, *batch),
+            )
+            found.update((key, json.loads(value)) for key, value in rows)
+    return found
+
+
+def get_cached(key: str) -> dict | None:
+    """
+    Look up a cached extraction answer.
+
+    Parameters
+    ----------
+    key : str
+        A key from ``make_cache_key``.
+
+    Returns
+    -------
+    dict | None
+        The cached ``{value, confidence, reasoning}`` dict, or None if the
+        key is missing, expired, or caching is disabled.
+    """
+    return get_cached_many([key]).get(key)
+
+
+def set_cached_many(values: dict[str, dict], ttl: int = LLM_CACHE_TTL_SECONDS) -> None:
+    """
+    Store several extraction answers in one transaction.
+
+    Expired entries are deleted in the same transaction, so the cache file
+    does not keep growing with stale answers.
+
+    Parameters
+    ----------
+    values : dict[str, dict]
+        ``{value, confidence, reasoning}`` dicts keyed by ``make_cache_key``
+        keys.
+    ttl : int, optional
+        Seconds until the entries expire. Default is ``LLM_CACHE_TTL_SECONDS``.
+    """
+    if not LLM_CACHE_ENABLED or not values:
+        return
+    now = time.time()
+    with closing(_connect()) as conn, conn:
+        conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            [(key, json.dumps(value), now + ttl) for key, value in values.items()],
+        )
+
+
+def set_cached(key: str, value: dict, ttl: int = LLM_CACHE_TTL_SECONDS) -> None:
+    """
+    Store an extraction answer in the cache.
+
+    Parameters
+    ----------
+    key : str
+        A key from ``make_cache_key``.
+    value : dict
+        The ``{value, confidence, reasoning}`` dict to store.
+    ttl : int, optional
+        Seconds until the entry expires. Default is ``LLM_CACHE_TTL_SECONDS``.
+    """
+    set_cached_many({key: value}, ttl)
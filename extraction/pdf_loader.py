@@ -1,17 +1,51 @@
+import hashlib
+import multiprocessing
 import os
-import pdfplumber
+import pickle
+import re
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import groupby
+from typing import BinaryIO
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
+from config import (
+    PDF_CACHE_DIRECTORY_PATH,
+    PDF_CACHE_ENABLED,
+    PDF_CACHE_MAX_AGE_SECONDS,
+    PDF_PARALLEL_MIN_PAGES,
+)
+from extraction.pdf_pages import extract_page_range, open_pdf
 
+# Bump whenever extraction, cleaning or chunking change output, so stale
+# cached chunks are not reused.
+PDF_CACHE_VERSION = "1"
 
-def extract_text_from_pdf(file_path: str) -> list[tuple[int, str]]:
+
+def extract_text_from_pdf(file_path: str | bytes) -> list[tuple[int, str]]:
     """
     Extract text from a PDF page by page, skipping empty pages.
 
+    PDFs with at least ``PDF_PARALLEL_MIN_PAGES`` pages are split into one
+    page range per CPU and extracted in a process pool. PyMuPDF is not
+    thread-safe, so threads would not help. Workers are started with
+    forkserver (or spawn) rather than fork, since the caller may have other
+    threads running, such as Streamlit's or ``preload_embedder``'s, and
+    forking mid-import can deadlock the children. Such workers import the
+    worker function's module afresh, so it lives in the PyMuPDF-only
+    ``pdf_pages`` module rather than here.
+
+    On the parallel path, PDF contents given as bytes are written once to
+    a temporary file that the workers open, rather than being pickled to
+    every worker; the file is deleted when extraction finishes.
+
     Parameters
     ----------
-    file_path : str
-        Path to the PDF file to load.
+    file_path : str | bytes
+        Path to the PDF file to load, or the PDF file contents.
 
     Returns
     -------
@@ -19,13 +53,39 @@ def extract_text_from_pdf(file_path: str) -> list[tuple[int, str]]:
         A list of tuples where each tuple contains the 1-based page number
         and the extracted text for that page.
     """
-    pages = []
-    with pdfplumber.open(file_path) as pdf:
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if text and text.strip():
-                pages.append((i + 1, text))
-    return pages
+    with open_pdf(file_path) as pdf:
+        page_count = pdf.page_count
+
+    workers = os.cpu_count() or 1
+    if page_count < PDF_PARALLEL_MIN_PAGES or workers == 1:
+        return extract_page_range((file_path, 0, page_count))
+
+    spool_path = None
+    if isinstance(file_path, bytes):
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spool:
+            spool.write(file_path)
+        file_path = spool_path = spool.name
+
+    try:
+        step = -(-page_count // workers)
+        ranges = [
+            (file_path, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        pages = []
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            # Workers then fork with the worker module already imported
+            context.set_forkserver_preload(["__main__", "extraction.pdf_pages"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context) as executor:
+            for part in executor.map(extract_page_range, ranges):
+                pages.extend(part)
+        return pages
+    finally:
+        if spool_path is not None:
+            os.unlink(spool_path)
 
 
 def find_repeated_lines(
@@ -52,18 +112,44 @@ def find_repeated_lines(
     if total_pages == 0:
         return set()
 
-    line_page_count: dict[str, int] = {}
+    line_page_count: Counter[str] = Counter()
     for text in page_texts:
-        unique_lines = set(line.strip() for line in text.splitlines() if line.strip())
-        for line in unique_lines:
-            line_page_count[line] = line_page_count.get(line, 0) + 1
+        line_page_count.update({line.strip() for line in text.splitlines()})
+    line_page_count.pop("", None)
 
+    threshold_count = total_pages * threshold
     return {
         line for line, count in line_page_count.items()
-        if count > total_pages * threshold
+        if count > threshold_count
     }
 
 
+# Matches whitespace-only lines, including their line break
+_BLANK_LINE_PATTERN = re.compile(r"^[^\S\n]*(?:\n|$)", re.MULTILINE)
+
+
+@lru_cache(maxsize=8)
+def _repeated_lines_pattern(repeated_lines: frozenset[str]) -> re.Pattern | None:
+    """
+    Compile one pattern matching any of the given lines, padding allowed.
+
+    Parameters
+    ----------
+    repeated_lines : frozenset[str]
+        Stripped lines to match.
+
+    Returns
+    -------
+    re.Pattern | None
+        A multiline pattern matching a whole line whose stripped text is in
+        ``repeated_lines``, or None if there are no lines to match.
+    """
+    if not repeated_lines:
+        return None
+    alternatives = "|".join(re.escape(line) for line in repeated_lines)
+    return re.compile(rf"^[^\S\n]*(?:{alternatives})[^\S\n]*$", re.MULTILINE)
+
+
 def clean_page_text(text: str, repeated_lines: set[str]) -> str:
     """
     Remove repeated lines from a page's text and strip extra whitespace.
@@ -80,11 +166,32 @@ def clean_page_text(text: str, repeated_lines: set[str]) -> str:
     str
         The cleaned text with repeated lines removed.
     """
-    cleaned = [
-        line for line in text.splitlines()
-        if line.strip() and line.strip() not in repeated_lines
-    ]
-    return "\n".join(cleaned).strip()
+    pattern = _repeated_lines_pattern(frozenset(repeated_lines))
+    if pattern is not None:
+        text = pattern.sub("", text)
+    return _BLANK_LINE_PATTERN.sub("", text).strip()
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    """
+    Return a shared text splitter for the given chunk settings.
+
+    Parameters
+    ----------
+    chunk_size : int
+        Maximum number of characters in each chunk.
+    chunk_overlap : int
+        Number of overlapping characters between adjacent chunks.
+
+    Returns
+    -------
+    RecursiveCharacterTextSplitter
+        A splitter reused across calls with the same settings.
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
 
 
 def chunk_pages(
@@ -116,44 +223,112 @@ def chunk_pages(
         `page_content` contains a chunk of text, and `metadata` contains
         `page`, `chunk_index`, and `source` keys.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    splitter = _get_splitter(chunk_size, chunk_overlap)
+    documents = splitter.create_documents(
+        [text for _, text in pages],
+        metadatas=[{"page": page_number, "source": source} for page_number, _ in pages],
     )
-    documents = []
-    for page_number, text in pages:
-        chunks = splitter.split_text(text)
-        for chunk_index, chunk in enumerate(chunks):
-            documents.append(
-                Document(
-                    page_content=chunk,
-                    metadata={
-                        "page": page_number,
-                        "chunk_index": chunk_index,
-                        "source": source,
-                    },
-                )
-            )
+
+    # Number chunks within each page, restarting at 0 on every new page
+    for _, page_documents in groupby(documents, key=lambda doc: doc.metadata["page"]):
+        for chunk_index, doc in enumerate(page_documents):
+            doc.metadata["chunk_index"] = chunk_index
     return documents
 
 
+def _cache_path(
+    pdf: str | bytes,
+    source: str,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> str:
+    """
+    Return the chunk cache file for a PDF's contents and chunk settings.
+
+    Parameters
+    ----------
+    pdf : str | bytes
+        Path to the PDF file, or the PDF file contents.
+    source : str
+        The source name stored in the chunks' metadata.
+    chunk_size : int
+        Maximum number of characters in each chunk.
+    chunk_overlap : int
+        Number of overlapping characters between adjacent chunks.
+
+    Returns
+    -------
+    str
+        Path of the pickle under ``PDF_CACHE_DIRECTORY_PATH``, named by a
+        SHA-256 of the file bytes, its name, and the chunk settings.
+    """
+    hasher = hashlib.sha256()
+    if isinstance(pdf, bytes):
+        hasher.update(pdf)
+    else:
+        with open(pdf, "rb") as f:
+            hasher.update(f.read())
+    hasher.update(
+        f"{source}:{chunk_size}:{chunk_overlap}:{PDF_CACHE_VERSION}".encode("utf-8")
+    )
+    return os.path.join(PDF_CACHE_DIRECTORY_PATH, f"{hasher.hexdigest()}.pkl")
+
+
+def _evict_stale_cache(max_age: int = PDF_CACHE_MAX_AGE_SECONDS) -> None:
+    """
+    Delete chunk cache files that have not been written for ``max_age`` seconds.
+
+    Parameters
+    ----------
+    max_age : int, optional
+        Maximum age in seconds. Default is ``PDF_CACHE_MAX_AGE_SECONDS``.
+    """
+    cutoff = time.time() - max_age
+    with os.scandir(PDF_CACHE_DIRECTORY_PATH) as entries:
+        for entry in entries:
+            if entry.name.endswith(".pkl") and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
 def load_and_chunk_pdf(
-    file_path: str,
+    file_path: str | bytes | BinaryIO,
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
+    source: str | None = None,
+    use_cache: bool = PDF_CACHE_ENABLED,
 ) -> list[Document]:
     """
     Extract text from a PDF and split it into chunked Document objects.
 
+    The PDF can be given as a path or in memory, as bytes or a binary
+    file-like object (e.g. ``io.BytesIO`` or a Streamlit upload), so
+    callers holding the contents need not write them to disk first.
+
+    With ``use_cache``, results are cached on disk under
+    ``PDF_CACHE_DIRECTORY_PATH``, keyed by a hash of the file contents, so
+    an unchanged PDF is only processed once. Cache files older than
+    ``PDF_CACHE_MAX_AGE_SECONDS`` are deleted whenever a new one is written.
+
     Parameters
     ----------
-    file_path : str
-        Path to the PDF file to load.
+    file_path : str | bytes | BinaryIO
+        Path to the PDF file to load, or its contents.
     chunk_size : int, optional
         Maximum number of characters in each chunk produced by the splitter.
         Default is 1000.
     chunk_overlap : int, optional
         Number of overlapping characters between adjacent chunks.
         Default is 200.
+    source : str, optional
+        The source name stored in each chunk's metadata. Defaults to the
+        file's basename for a path, or an empty string otherwise.
+    use_cache : bool, optional
+        Whether to read and write the on-disk chunk cache. The cache stores
+        the document's full text, so it is opt-in. Default is
+        ``PDF_CACHE_ENABLED`` (env ``PDF_CACHE_ENABLED``, off if unset).
 
     Returns
     -------
@@ -162,7 +337,63 @@ def load_and_chunk_pdf(
         `page_content` contains a chunk of text, and `metadata` contains
         `page`, `chunk_index`, and `source` keys.
     """
-    pages = extract_text_from_pdf(file_path)
+    if isinstance(file_path, (str, os.PathLike)):
+        pdf = os.fspath(file_path)
+        if source is None:
+            source = os.path.basename(pdf)
+    elif isinstance(file_path, (bytes, bytearray, memoryview)):
+        pdf = bytes(file_path)
+    else:
+        pdf = file_path.read()
+    if source is None:
+        source = ""
+
+    cache_path = None
+    if use_cache:
+        cache_path = _cache_path(pdf, source, chunk_size, chunk_overlap)
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+
+    documents = _load_and_chunk_pdf(pdf, source, chunk_size, chunk_overlap)
+
+    if cache_path is not None:
+        os.makedirs(PDF_CACHE_DIRECTORY_PATH, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(documents, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        _evict_stale_cache()
+
+    return documents
+
+
+def _load_and_chunk_pdf(
+    pdf: str | bytes,
+    source: str,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> list[Document]:
+    """
+    Uncached implementation of ``load_and_chunk_pdf``.
+
+    Parameters
+    ----------
+    pdf : str | bytes
+        Path to the PDF file to load, or the PDF file contents.
+    source : str
+        The source name stored in each chunk's metadata.
+    chunk_size : int
+        Maximum number of characters in each chunk.
+    chunk_overlap : int
+        Number of overlapping characters between adjacent chunks.
+
+    Returns
+    -------
+    list[Document]
+        See ``load_and_chunk_pdf``.
+    """
+    pages = extract_text_from_pdf(pdf)
     if not pages:
         return []
 
@@ -175,5 +406,4 @@ def load_and_chunk_pdf(
     ]
     pages = [(page_num, text) for page_num, text in pages if text]
 
-    source = os.path.basename(file_path)
     return chunk_pages(pages, chunk_size, chunk_overlap, source=source)
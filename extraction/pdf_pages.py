@@ -0,0 +1,50 @@
+import pymupdf
+
+# Imports only PyMuPDF: ``extract_page_range`` runs in pool workers, which
+# import this module afresh, and LangChain would dominate their start-up.
+
+
+def open_pdf(pdf: str | bytes) -> pymupdf.Document:
+    """
+    Open a PDF from a path or from its contents.
+
+    Parameters
+    ----------
+    pdf : str | bytes
+        Path to the PDF file, or the PDF file contents.
+
+    Returns
+    -------
+    pymupdf.Document
+        The opened document.
+    """
+    if isinstance(pdf, bytes):
+        return pymupdf.open(stream=pdf, filetype="pdf")
+    return pymupdf.open(pdf)
+
+
+def extract_page_range(args: tuple[str | bytes, int, int]) -> list[tuple[int, str]]:
+    """
+    Extract text from a contiguous range of pages, skipping empty pages.
+
+    Runs in a worker process, so it opens its own handle on the PDF.
+
+    Parameters
+    ----------
+    args : tuple[str | bytes, int, int]
+        The PDF path or contents, and the 0-based ``start`` (inclusive) and
+        ``stop`` (exclusive) page indices.
+
+    Returns
+    -------
+    list[tuple[int, str]]
+        ``(page_number, text)`` tuples with 1-based page numbers.
+    """
+    file_path, start, stop = args
+    pages = []
+    with open_pdf(file_path) as pdf:
+        for i in range(start, stop):
+            text = pdf[i].get_text("text")
+            if text and text.strip():
+                pages.append((i + 1, text))
+    return pages
@@ -0,0 +1,197 @@
+import threading
+
+import hnswlib
+import numpy as np
+
+
+class SimpleVectorStore:
+    """
+    An in-memory vector store on a bare ``hnswlib`` index.
+
+    Implements the subset of the ``chromadb.Collection`` interface used in
+    this project (``add``, ``get``, ``query``, ``count``), with the same
+    return shapes, so it can stand in for an ephemeral collection without
+    ChromaDB's SQLite metadata layer. Ids, texts and metadata are kept in
+    plain lists indexed by the hnswlib label.
+
+    The index parameters use the same names as ChromaDB's ``hnsw``
+    configuration, so one settings dict can configure either backend.
+
+    Safe to share between threads: ``add``, ``get`` and ``query`` hold a
+    lock, so concurrent builds of the same store cannot interleave.
+
+    Parameters
+    ----------
+    name : str
+        Name of the store, mirroring ``Collection.name``.
+    metadata : dict, optional
+        Store-level metadata, mirroring ``Collection.metadata``. Default is
+        None.
+    space : str, optional
+        hnswlib distance space. Default is ``"cosine"``.
+    max_neighbors : int, optional
+        Maximum neighbours per node (hnswlib's ``M``). Default is 16.
+    ef_construction : int, optional
+        Candidate list size while building. Default is 100.
+    ef_search : int, optional
+        Candidate list size while querying. Default is 100.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        metadata: dict | None = None,
+        space: str = "cosine",
+        max_neighbors: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 100,
+    ):
+        self.name = name
+        self.metadata = metadata
+        self._space = space
+        self._max_neighbors = max_neighbors
+        self._ef_construction = ef_construction
+        self._ef_search = ef_search
+        # Created on the first add, once the embedding dimension is known
+        self._index = None
+        self._ids = []
+        self._documents = []
+        self._metadatas = []
+        self._labels = {}
+        self._lock = threading.Lock()
+
+    def count(self) -> int:
+        """
+        Return the number of stored chunks.
+
+        Returns
+        -------
+        int
+            The number of items added so far.
+        """
+        return len(self._ids)
+
+    def add(
+        self,
+        ids: list[str],
+        documents: list[str],
+        embeddings,
+        metadatas: list[dict],
+    ) -> None:
+        """
+        Add chunks and their embeddings to the store.
+
+        Ids that are already stored, or repeated within ``ids``, are
+        ignored, so adding the same chunk twice keeps one copy.
+
+        Parameters
+        ----------
+        ids : list[str]
+            Ids, one per chunk.
+        documents : list[str]
+            The chunk texts.
+        embeddings : array-like
+            One embedding per chunk, shape ``(len(ids), dim)``.
+        metadatas : list[dict]
+            One metadata dict per chunk.
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            first = {}
+            for i, chunk_id in enumerate(ids):
+                if chunk_id not in self._labels:
+                    first.setdefault(chunk_id, i)
+            keep = list(first.values())
+            if not keep:
+                return
+
+            if self._index is None:
+                self._index = hnswlib.Index(space=self._space, dim=vectors.shape[1])
+                self._index.init_index(
+                    max_elements=len(keep),
+                    ef_construction=self._ef_construction,
+                    M=self._max_neighbors,
+                )
+                self._index.set_ef(self._ef_search)
+
+            start = len(self._ids)
+            needed = start + len(keep)
+            if needed > self._index.get_max_elements():
+                self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+            self._index.add_items(vectors[keep], np.arange(start, needed))
+
+            self._labels.update((ids[i], start + j) for j, i in enumerate(keep))
+            self._ids.extend(ids[i] for i in keep)
+            self._documents.extend(documents[i] for i in keep)
+            self._metadatas.extend(metadatas[i] for i in keep)
+
+    def get(self, ids: list[str], include: list[str] | None = None) -> dict:
+        """
+        Look up chunks by id.
+
+        Parameters
+        ----------
+        ids : list[str]
+            The ids to look up. Unknown ids are skipped.
+        include : list[str], optional
+            Which of ``"documents"`` and ``"metadatas"`` to return alongside
+            the ids. Default is both.
+
+        Returns
+        -------
+        dict
+            A dict with ``ids`` and the requested fields, in the same shape
+            as ``chromadb.Collection.get``.
+        """
+        include = ["documents", "metadatas"] if include is None else include
+        with self._lock:
+            labels = [self._labels[chunk_id] for chunk_id in ids if chunk_id in self._labels]
+            result = {"ids": [self._ids[label] for label in labels]}
+            if "documents" in include:
+                result["documents"] = [self._documents[label] for label in labels]
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[label] for label in labels]
+        return result
+
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        include: list[str] | None = None,
+    ) -> dict:
+        """
+        Return the nearest chunks for each query embedding.
+
+        Parameters
+        ----------
+        query_embeddings : array-like
+            One embedding per query, shape ``(n_queries, dim)``.
+        n_results : int, optional
+            Number of results per query, capped at ``count()``. Default is 10.
+        include : list[str], optional
+            Which of ``"documents"``, ``"metadatas"`` and ``"distances"`` to
+            return alongside the ids. Default is all three.
+
+        Returns
+        -------
+        dict
+            A dict with ``ids`` and the requested fields, each holding one
+            list per query, in the same shape as ``chromadb.Collection.query``.
+        """
+        include = ["documents", "metadatas", "distances"] if include is None else include
+        vectors = np.asarray(query_embeddings, dtype=np.float32)
+        with self._lock:
+            k = min(n_results, self.count())
+            if k:
+                labels, distances = self._index.knn_query(vectors, k=k)
+            else:
+                labels = distances = np.empty((len(vectors), 0))
+
+            result = {"ids": [[self._ids[label] for label in row] for row in labels]}
+            if "documents" in include:
+                result["documents"] = [[self._documents[label] for label in row] for row in labels]
+            if "metadatas" in include:
+                result["metadatas"] = [[self._metadatas[label] for label in row] for row in labels]
+        if "distances" in include:
+            result["distances"] = distances.tolist()
+        return result
@@ -1,37 +1,211 @@
-import os
+import atexit
+import hashlib
 import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import chromadb
+from chromadb.errors import InvalidArgumentError, NotFoundError
 from langchain_core.documents import Document
-from langchain_huggingface import HuggingFaceEmbeddings
-from config import EMBEDDING_MODEL, CHROMA_DB_PERSIST_DIRECTORY_PATH
+from extraction.embeddings import SentenceTransformerEmbeddings
+from extraction.simple_store import SimpleVectorStore
+from config import (
+    EMBEDDING_MODEL,
+    CHROMA_DB_ON_TMPFS,
+    CHROMA_DB_PERSIST_DIRECTORY_PATH,
+    CHROMA_SERVER_HOST,
+    CHROMA_SERVER_PORT,
+    HNSW_CONSTRUCTION_EF,
+    HNSW_M,
+    HNSW_SEARCH_EF,
+    HNSW_SPACE,
+    MAX_MEMORY_STORES,
+    VECTOR_STORE_BATCH_SIZE,
+)
 _embedder = None
+_embedder_lock = threading.Lock()
+# In-memory stores by collection name, least recently used first
+_memory_stores = OrderedDict()
+_memory_stores_lock = threading.Lock()
 
-def _get_embedder() -> HuggingFaceEmbeddings:
+def _get_embedder() -> SentenceTransformerEmbeddings:
     """
-    Return a shared HuggingFaceEmbeddings instance, creating it on first call.
+    Return a shared SentenceTransformerEmbeddings instance, creating it on first call.
+
+    Safe to call from several threads; the model is only loaded once. The
+    model is warmed up before being returned.
 
     Returns
     -------
-    HuggingFaceEmbeddings
+    SentenceTransformerEmbeddings
         A reusable embedding model instance.
     """
     global _embedder
     if _embedder is None:
-        _embedder = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+        with _embedder_lock:
+            if _embedder is None:
+                embedder = SentenceTransformerEmbeddings(EMBEDDING_MODEL)
+                embedder.warm_up()
+                _embedder = embedder
     return _embedder
 
 
+def preload_embedder() -> None:
+    """
+    Start loading the shared embedder in a background thread.
+
+    Call this before other slow work, such as ``load_and_chunk_pdf``, so
+    the model load and warm-up overlap with it. A later ``_get_embedder``
+    call (e.g. from ``create_vector_store``) waits for the load to finish
+    instead of starting a second one.
+    """
+    threading.Thread(target=_get_embedder, daemon=True).start()
+
+
+@lru_cache(maxsize=4)
+def _get_client(path: str) -> chromadb.ClientAPI:
+    """
+    Return a shared persistent ChromaDB client for a directory.
+
+    When ``CHROMA_SERVER_HOST`` is set, returns an HTTP client for that
+    Chroma server instead, so several processes (e.g. Streamlit sessions)
+    share one index rather than each opening the directory.
+
+    When the store lives on tmpfs (``CHROMA_DB_ON_TMPFS``), the directory
+    is removed when the process exits.
+
+    Parameters
+    ----------
+    path : str
+        The persist directory. Ignored in server mode.
+
+    Returns
+    -------
+    chromadb.ClientAPI
+        A client reused across calls with the same path.
+    """
+    if CHROMA_SERVER_HOST:
+        return chromadb.HttpClient(host=CHROMA_SERVER_HOST, port=CHROMA_SERVER_PORT)
+    if CHROMA_DB_ON_TMPFS and path == CHROMA_DB_PERSIST_DIRECTORY_PATH:
+        atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return chromadb.PersistentClient(path=path)
+
+
+@lru_cache(maxsize=8)
+def _get_collection(path: str, collection_name: str) -> chromadb.Collection:
+    """
+    Return a shared handle on an existing persistent collection.
+
+    Parameters
+    ----------
+    path : str
+        The persist directory.
+    collection_name : str
+        Name of the ChromaDB collection.
+
+    Returns
+    -------
+    chromadb.Collection
+        The collection, reused across calls until it is rebuilt.
+    """
+    return _get_client(path).get_collection(name=collection_name)
+
+
+def _hnsw_config(vector_count: int) -> dict:
+    """
+    Pick HNSW index settings for a corpus of a given size.
+
+    Small corpora (the usual case: one or a few documents) get a dense
+    graph and wide candidate lists, since recall matters more than speed
+    and the extra build time is negligible at that size. Larger corpora
+    trade some graph density for build time and widen ``ef_search`` to
+    hold recall. Any ``HNSW_*`` value set in the environment wins over the
+    size-based choice.
+
+    Parameters
+    ----------
+    vector_count : int
+        Number of vectors the index is created for.
+
+    Returns
+    -------
+    dict
+        ``space``, ``max_neighbors``, ``ef_construction`` and ``ef_search``
+        values, as taken by ChromaDB's ``hnsw`` configuration.
+    """
+    if vector_count < 100_000:
+        m, ef_construction, ef_search = 32, 200, 64
+    elif vector_count < 1_000_000:
+        m, ef_construction, ef_search = 24, 100, 100
+    else:
+        m, ef_construction, ef_search = 32, 128, 200
+    return {
+        "space": HNSW_SPACE,
+        "max_neighbors": HNSW_M or m,
+        "ef_construction": HNSW_CONSTRUCTION_EF or ef_construction,
+        "ef_search": HNSW_SEARCH_EF or ef_search,
+    }
+
+
+def _chunk_id(doc: Document) -> str:
+    """
+    Return a stable, content-derived id for a chunk.
+
+    The id hashes the chunk text together with its source, page, and
+    chunk index, so re-adding an unchanged chunk maps to the same id while
+    identical text on two pages still gets two ids.
+
+    Parameters
+    ----------
+    doc : Document
+        A chunk produced by ``load_and_chunk_pdf``.
+
+    Returns
+    -------
+    str
+        A 16-character hex id.
+    """
+    meta = doc.metadata
+    key = f"{meta['source']}\0{meta['page']}\0{meta['chunk_index']}\0{doc.page_content}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
 def create_vector_store(
     documents: list[Document],
     collection_name: str = "document_chunks",
     in_memory: bool = False,
-) -> chromadb.Collection:
+    force_rebuild: bool = False,
+    client: chromadb.ClientAPI | None = None,
+) -> chromadb.Collection | SimpleVectorStore:
     """
     Embed documents and store them in a ChromaDB collection.
 
-    When ``in_memory`` is False (default), uses a persistent client and
-    deletes any existing store first so the build is always clean.
-    When ``in_memory`` is True, uses an ephemeral client (no disk I/O).
+    When ``in_memory`` is False (default), uses the shared persistent (or
+    server) client from ``_get_client``.
+    When ``in_memory`` is True, uses a ``SimpleVectorStore`` instead: a
+    bare hnswlib index with no SQLite layer and no disk I/O, kept under
+    ``collection_name``. Only the ``MAX_MEMORY_STORES`` most recently used
+    in-memory stores are kept; older ones are dropped.
+    Either way the collection is updated incrementally: chunks are keyed by
+    a content hash (see ``_chunk_id``) and chunks already in the collection
+    are not embedded again, unless ``force_rebuild`` clears it first.
+
+    A new collection's HNSW index is sized for ``len(documents)`` vectors
+    (see ``_hnsw_config``); an existing collection keeps the settings it
+    was created with.
+
+    The source file name is stored once, as ``source`` in the collection's
+    metadata, when the collection is created. Chunk metadata holds only
+    ``page`` and ``chunk_index``, plus ``source`` for chunks from any other
+    file, so readers should use
+    ``meta.get("source") or (collection.metadata or {}).get("source")``;
+    collections built from no documents, or before this layout, have no
+    collection metadata.
+
+    Documents are embedded and written in batches of
+    ``VECTOR_STORE_BATCH_SIZE``, with one thread encoding the next batch
+    while another writes the previous one to ChromaDB.
 
     Parameters
     ----------
@@ -40,52 +214,109 @@ def create_vector_store(
     collection_name : str, optional
         Name of the ChromaDB collection. Default is ``"document_chunks"``.
     in_memory : bool, optional
-        If True, use an ephemeral (in-memory) client instead of persisting
-        to disk. Default is False.
+        If True, keep the vectors in memory instead of persisting to disk.
+        Default is False.
+    force_rebuild : bool, optional
+        If True, delete the existing collection first so the build is
+        clean. Default is False.
+    client : chromadb.ClientAPI, optional
+        ChromaDB client to use instead of the one selected by ``in_memory``,
+        e.g. a client cached by the caller. Default is None.
 
     Returns
     -------
-    chromadb.Collection
-        The ChromaDB collection containing the embedded documents.
+    chromadb.Collection | SimpleVectorStore
+        The collection containing the embedded documents.
     """
-    if in_memory:
-        client = chromadb.EphemeralClient()
+    hnsw = _hnsw_config(len(documents))
+    collection_metadata = {"source": documents[0].metadata["source"]} if documents else None
+    if client is None and in_memory:
+        with _memory_stores_lock:
+            if force_rebuild:
+                _memory_stores.pop(collection_name, None)
+            collection = _memory_stores.get(collection_name)
+            if collection is None:
+                collection = _memory_stores[collection_name] = SimpleVectorStore(
+                    collection_name, metadata=collection_metadata, **hnsw
+                )
+                while len(_memory_stores) > MAX_MEMORY_STORES:
+                    _memory_stores.popitem(last=False)
+            else:
+                _memory_stores.move_to_end(collection_name)
     else:
-        if os.path.exists(CHROMA_DB_PERSIST_DIRECTORY_PATH):
-            shutil.rmtree(CHROMA_DB_PERSIST_DIRECTORY_PATH)
-        client = chromadb.PersistentClient(path=CHROMA_DB_PERSIST_DIRECTORY_PATH)
+        if client is None:
+            client = _get_client(CHROMA_DB_PERSIST_DIRECTORY_PATH)
 
-    collection = client.get_or_create_collection(name=collection_name)
+        if force_rebuild:
+            # The client is shared, so drop the old collection rather than its files
+            try:
+                client.delete_collection(name=collection_name)
+            except NotFoundError:
+                pass
+            _get_collection.cache_clear()
 
-    embedder = _get_embedder()
+        # Only a new collection takes our metadata; an existing one keeps its source
+        try:
+            collection = client.get_collection(name=collection_name)
+        except NotFoundError:
+            collection = client.get_or_create_collection(
+                name=collection_name,
+                configuration={"hnsw": hnsw},
+                metadata=collection_metadata,
+            )
 
-    ids = []
-    texts = []
-    metadatas = []
+    embedder = _get_embedder()
 
-    for i, doc in enumerate(documents):
-        ids.append(f"chunk_{i}")
-        texts.append(doc.page_content)
-        metadatas.append({
-            "page": doc.metadata["page"],
-            "chunk_index": doc.metadata["chunk_index"],
-            "source": doc.metadata["source"],
-        })
+    ids = [_chunk_id(doc) for doc in documents]
+    texts = [doc.page_content for doc in documents]
+    metadatas = [
+        {"page": meta["page"], "chunk_index": meta["chunk_index"]}
+        for meta in (doc.metadata for doc in documents)
+    ]
+    collection_source = (collection.metadata or {}).get("source")
+    for metadata, doc in zip(metadatas, documents):
+        if doc.metadata["source"] != collection_source:
+            metadata["source"] = doc.metadata["source"]
 
-    embeddings = embedder.embed_documents(texts)
+    # Skip chunks that are already embedded in the collection
+    existing = set()
+    for start in range(0, len(ids), VECTOR_STORE_BATCH_SIZE):
+        existing.update(
+            collection.get(ids=ids[start:start + VECTOR_STORE_BATCH_SIZE], include=[])["ids"]
+        )
+    keep = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing]
+    ids = [ids[i] for i in keep]
+    texts = [texts[i] for i in keep]
+    metadatas = [metadatas[i] for i in keep]
 
-    collection.add(
-        ids=ids,
-        documents=texts,
-        embeddings=embeddings,
-        metadatas=metadatas,
-    )
+    # Embeddings stay float32: ChromaDB converts whatever it is given to
+    # float32 for both the HNSW index and storage, so int8/float16 input
+    # would lose precision without making the collection any smaller.
+    starts = range(0, len(texts), VECTOR_STORE_BATCH_SIZE)
+    with ThreadPoolExecutor(max_workers=1) as encoder, ThreadPoolExecutor(max_workers=1) as writer:
+        embedded = [
+            encoder.submit(embedder.encode, texts[start:start + VECTOR_STORE_BATCH_SIZE])
+            for start in starts
+        ]
+        written = []
+        for start, embeddings in zip(starts, embedded):
+            stop = start + VECTOR_STORE_BATCH_SIZE
+            written.append(writer.submit(
+                collection.add,
+                ids=ids[start:stop],
+                documents=texts[start:stop],
+                embeddings=embeddings.result(),
+                metadatas=metadatas[start:stop],
+            ))
+        for write in written:
+            write.result()
 
     return collection
 
 
 def load_vector_store(
     collection_name: str = "document_chunks",
+    client: chromadb.ClientAPI | None = None,
 ) -> chromadb.Collection:
     """
     Load an existing ChromaDB collection from disk without re-embedding.
@@ -94,28 +325,34 @@ def load_vector_store(
     ----------
     collection_name : str, optional
         Name of the ChromaDB collection. Default is ``"document_chunks"``.
+    client : chromadb.ClientAPI, optional
+        Client to load from instead of the shared persistent client.
+        Default is None.
 
     Returns
     -------
     chromadb.Collection
         The existing ChromaDB collection.
     """
-    client = chromadb.PersistentClient(path=CHROMA_DB_PERSIST_DIRECTORY_PATH)
-    return client.get_collection(name=collection_name)
+    if client is not None:
+        return client.get_collection(name=collection_name)
+    return _get_collection(CHROMA_DB_PERSIST_DIRECTORY_PATH, collection_name)
 
 
 def query_vector_store(
-    collection: chromadb.Collection,
+    collection: chromadb.Collection | SimpleVectorStore,
     query: str,
     k: int = 5,
 ) -> dict:
     """
     Query the collection and return the most relevant document chunks.
 
+    Shorthand for ``query_vector_store_batch`` with a single query.
+
     Parameters
     ----------
-    collection : chromadb.Collection
-        A ChromaDB collection to search.
+    collection : chromadb.Collection | SimpleVectorStore
+        A collection from ``create_vector_store`` or ``load_vector_store``.
     query : str
         The search query string.
     k : int, optional
@@ -127,21 +364,57 @@ def query_vector_store(
         Raw ChromaDB query results with keys ``documents``, ``metadatas``,
         ``distances``, and ``ids``.
     """
-    # Validate that k does not exceed collection size
-    collection_size = collection.count()
-    if k > collection_size:
-        raise ValueError(
-            f"Requested k={k} results, but collection only contains {collection_size} documents. "
-            f"Set k to a value <= {collection_size}."
-        )
+    return query_vector_store_batch(collection, [query], k=k)
+
+
+def query_vector_store_batch(
+    collection: chromadb.Collection | SimpleVectorStore,
+    queries: list[str],
+    k: int = 5,
+) -> dict:
+    """
+    Query the collection with several strings in a single call.
+
+    All queries are embedded in one forward pass and sent to ChromaDB as
+    one batched query, instead of one embedding + search per query.
+
+    If ``k`` exceeds the collection size, fewer results are returned. The
+    size is only looked up when ChromaDB rejects ``k``, not on every query.
+
+    Parameters
+    ----------
+    collection : chromadb.Collection | SimpleVectorStore
+        A collection from ``create_vector_store`` or ``load_vector_store``.
+    queries : list[str]
+        The search query strings.
+    k : int, optional
+        Number of top results to return per query. Default is 5.
+
+    Returns
+    -------
+    dict
+        Raw ChromaDB query results with keys ``documents``, ``metadatas``,
+        ``distances``, and ``ids``. Each value holds one list per query,
+        in the same order as ``queries``.
+    """
     embedder = _get_embedder()
-    query_embedding = embedder.embed_query(query)
+    query_embeddings = embedder.encode(queries)
 
-    return collection.query(
-        query_embeddings=[query_embedding],
-        n_results=k,
-        include=["documents", "metadatas", "distances"],
-    )
+    try:
+        return collection.query(
+            query_embeddings=query_embeddings,
+            n_results=k,
+            include=["documents", "metadatas", "distances"],
+        )
+    except InvalidArgumentError:
+        collection_size = collection.count()
+        if k <= collection_size:
+            raise
+        return collection.query(
+            query_embeddings=query_embeddings,
+            n_results=collection_size,
+            include=["documents", "metadatas", "distances"],
+        )
 
 
 # Test Example
@@ -157,12 +430,13 @@ if __name__ == "__main__":
 
     pdf_path = pdfs[0]
     print(f"Loading PDF: {pdf_path}")
+    preload_embedder()
     documents = load_and_chunk_pdf(pdf_path)
     print(f"Total chunks: {len(documents)}")
 
     # 2. Create the vector store (deletes old one first)
     print("\nCreating vector store (this may take a moment)...")
-    collection = create_vector_store(documents)
+    collection = create_vector_store(documents, force_rebuild=True)
     print(f"Vector store created — {collection.count()} chunks stored in chroma_db")
 
     # 3. Run test queries
@@ -171,11 +445,12 @@ if __name__ == "__main__":
         "How much is the credit agreement",
         "(the “Borrower”)"
 ]
+    k = min(10, collection.count())
     for query in test_queries:
         print(f"\n{'='*60}")
         print(f"Query: {query}")
         print("=" * 60)
-        results = query_vector_store(collection, query, k=11)
+        results = query_vector_store(collection, query, k=k)
 
         for i in range(len(results["documents"][0])):
             doc_text = results["documents"][0][i]
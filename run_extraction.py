@@ -1,5 +1,5 @@
 import sys
-from extraction.vector_store import load_vector_store
+from extraction.vector_store import load_vector_store, preload_embedder
 from extraction.extractor import extract_all_attributes, save_results
 from extraction.vector_store import query_vector_store
 DEFAULT_ATTRIBUTES = [
@@ -10,13 +10,18 @@ DEFAULT_ATTRIBUTES = [
 def main():
     attributes = sys.argv[1:] if len(sys.argv) > 1 else DEFAULT_ATTRIBUTES
 
+    # Load the embedding model while the vector store is opened
+    preload_embedder()
     print("Loading vector store...")
     vs = load_vector_store()
     print(f"Vector store created — {vs.count()} chunks stored in ./chroma_db")
     print(f"Extracting {len(attributes)} attributes...")
 
 
-    results = extract_all_attributes(vs, attributes)
+    def show_progress(done: int, total: int) -> None:
+        print(f"  {done}/{total} attributes extracted")
+
+    results = extract_all_attributes(vs, attributes, progress_callback=show_progress)
 
     for name, result in results.items():
         print(f"\n{'='*60}")
@@ -1,14 +1,14 @@
 import sys
 import os
 import json
-import tempfile
+import hashlib
 
 # Add project root to path so imports work when running from streamlit/ folder
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import streamlit as st
 from extraction.pdf_loader import load_and_chunk_pdf
-from extraction.vector_store import create_vector_store
+from extraction.vector_store import _get_embedder, create_vector_store
 from extraction.extractor import extract_attribute, save_results
 
 st.set_page_config(page_title="Document Attribute Extractor", layout="wide")
@@ -34,6 +34,16 @@ def resolve_query(term: str, doc_type: str) -> str:
     return mapping.get(term.lower().strip(), term)
 
 
+@st.cache_resource
+def get_cached_embedder():
+    """Load the embedding model once per server process, not once per rerun."""
+    return _get_embedder()
+
+
+# Load the model as soon as the app starts rather than on the first Extract click
+get_cached_embedder()
+
+
 # ── Sidebar ─────────────────────────────────────────────────────────
 
 st.sidebar.header("1. Upload PDF")
@@ -76,83 +86,90 @@ if extract_clicked and uploaded_pdf and search_term.strip():
     if not matched:
         st.warning(f"No mapping found for \"{term}\" — using raw input as query.")
 
-    # Step 1: Save uploaded PDF to a temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(uploaded_pdf.read())
-        tmp_path = tmp.name
-
-    try:
-        # Step 2: Load and chunk the PDF
-        with st.status("Processing document...", expanded=True) as status:
-            st.write("Extracting text and chunking PDF...")
-            documents = load_and_chunk_pdf(tmp_path)
-            st.write(f"Created {len(documents)} chunks.")
-
-            # Step 3: Build vector store
-            st.write("Building vector store...")
-            collection = create_vector_store(documents, in_memory=True)
-            st.write(f"Vector store ready ({collection.count()} chunks embedded).")
-            status.update(label="Document processed.", state="complete")
-
-        # Step 4: Extract attribute
-        with st.spinner(f"Extracting: {term}..."):
-            result = extract_attribute(collection, query)
-
-        # Step 5: Display result
-        st.header("Result")
-
-        value = result.get("value", "not found")
-        confidence = result.get("confidence", "low").lower()
-        reasoning = result.get("reasoning", "")
-        source_pages = result.get("source_pages", [])
-        source_chunks = result.get("source_chunks", [])
-
-        color = CONFIDENCE_COLORS.get(confidence, "#6c757d")
-
-        st.subheader(term.title())
-
-        col1, col2, col3 = st.columns([3, 1, 2])
-        with col1:
-            st.markdown(f"**Value:** {value}")
-        with col2:
-            st.markdown(
-                f'<span style="background-color:{color};color:white;'
-                f'padding:4px 12px;border-radius:12px;font-size:0.85em;">'
-                f'{confidence.upper()}</span>',
-                unsafe_allow_html=True,
-            )
-        with col3:
-            st.markdown(f"**Pages:** {', '.join(str(p) for p in source_pages)}")
-
-        if reasoning:
-            st.markdown(f"**Reasoning:** {reasoning}")
-
-        with st.expander("Source chunks"):
-            for j, chunk in enumerate(source_chunks):
-                st.text_area(
-                    f"Chunk {j + 1}",
-                    value=chunk,
-                    height=120,
-                    disabled=True,
-                    key=f"{term}_chunk_{j}",
-                )
-
-        st.divider()
-
-        # Step 6: Save and offer download
-        results = {term: result}
-        results_json = json.dumps(results, indent=2)
-        save_results(results)
-
-        st.download_button(
-            label="Download result as JSON",
-            data=results_json,
-            file_name="results.json",
-            mime="application/json",
+    # Step 1: Read the uploaded PDF. It is never cached; only large PDFs touch
+    # disk, as a temp file that exists while their pages are extracted.
+    pdf_bytes = uploaded_pdf.getvalue()
+
+    # One collection per PDF contents and name, the same inputs as the chunk
+    # ids (source + text), so re-running on the same upload skips embedding
+    upload_hash = hashlib.sha256(pdf_bytes)
+    upload_hash.update(uploaded_pdf.name.encode("utf-8"))
+    collection_name = f"upload_{upload_hash.hexdigest()[:16]}"
+
+    # Step 2: Load and chunk the PDF
+    with st.status("Processing document...", expanded=True) as status:
+        st.write("Extracting text and chunking PDF...")
+        documents = load_and_chunk_pdf(
+            pdf_bytes, source=uploaded_pdf.name, use_cache=False
         )
+        st.write(f"Created {len(documents)} chunks.")
+
+        # Step 3: Build vector store
+        st.write("Building vector store...")
+        collection = create_vector_store(
+            documents,
+            collection_name=collection_name,
+            in_memory=True,
+        )
+        st.write(f"Vector store ready ({collection.count()} chunks embedded).")
+        status.update(label="Document processed.", state="complete")
+
+    # Step 4: Extract attribute
+    with st.spinner(f"Extracting: {term}..."):
+        result = extract_attribute(collection, query)
+
+    # Step 5: Display result
+    st.header("Result")
+
+    value = result.get("value", "not found")
+    confidence = result.get("confidence", "low").lower()
+    reasoning = result.get("reasoning", "")
+    source_pages = result.get("source_pages", [])
+    source_chunks = result.get("source_chunks", [])
+
+    color = CONFIDENCE_COLORS.get(confidence, "#6c757d")
+
+    st.subheader(term.title())
+
+    col1, col2, col3 = st.columns([3, 1, 2])
+    with col1:
+        st.markdown(f"**Value:** {value}")
+    with col2:
+        st.markdown(
+            f'<span style="background-color:{color};color:white;'
+            f'padding:4px 12px;border-radius:12px;font-size:0.85em;">'
+            f'{confidence.upper()}</span>',
+            unsafe_allow_html=True,
+        )
+    with col3:
+        st.markdown(f"**Pages:** {', '.join(str(p) for p in source_pages)}")
+
+    if reasoning:
+        st.markdown(f"**Reasoning:** {reasoning}")
+
+    with st.expander("Source chunks"):
+        for j, chunk in enumerate(source_chunks):
+            st.text_area(
+                f"Chunk {j + 1}",
+                value=chunk,
+                height=120,
+                disabled=True,
+                key=f"{term}_chunk_{j}",
+            )
+
+    st.divider()
+
+    # Step 6: Save and offer download
+    results = {term: result}
+    results_json = json.dumps(results, indent=2)
+    save_results(results)
 
-    finally:
-        os.unlink(tmp_path)
+    st.download_button(
+        label="Download result as JSON",
+        data=results_json,
+        file_name="results.json",
+        mime="application/json",
+    )
 
 elif not extract_clicked:
     st.info("Upload a PDF and enter a search term in the sidebar, then click Extract.")
@@ -1,6 +1,6 @@
 import glob
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import HuggingFaceEmbeddings
+from extraction.embeddings import SentenceTransformerEmbeddings
 from config import GEMINI_MODEL, EMBEDDING_MODEL, get_secret
 
 # Test 1: Can we call Gemini?
@@ -10,8 +10,8 @@ response = llm.invoke("Say 'Hello, the setup is working!' and nothing else.")
 print(f"LLM Response: {response.content}")
 
 # Test 2: Can we generate embeddings?
-print("\nTesting HuggingFace Embeddings...")
-embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+print("\nTesting Sentence Transformers Embeddings...")
+embeddings = SentenceTransformerEmbeddings(EMBEDDING_MODEL)
 result = embeddings.embed_query("This is a test sentence.")
 print(f"Embedding model: {EMBEDDING_MODEL}")
 print(f"Embedding dimension: {len(result)}")
@@ -27,14 +27,14 @@ results = collection.query(query_texts=["test"], n_results=1)
 print(f"ChromaDB query result: {results['documents']}")
 
 # Test 4: Can we read a PDF?
-print("\nTesting pdfplumber...")
-import pdfplumber
+print("\nTesting PyMuPDF...")
+import pymupdf
 pdfs = glob.glob("sample_docs/*.pdf")
 if pdfs:
-    with pdfplumber.open(pdfs[0]) as pdf:
+    with pymupdf.open(pdfs[0]) as pdf:
         print(f"PDF loaded: {pdfs[0]}")
-        print(f"Number of pages: {len(pdf.pages)}")
-        first_page_text = pdf.pages[0].extract_text()
+        print(f"Number of pages: {pdf.page_count}")
+        first_page_text = pdf[0].get_text("text")
         print(f"First 200 chars: {first_page_text[:200] if first_page_text else 'No text extracted'}")
 else:
     print("No PDFs found in sample_docs/ — add some before building the project")